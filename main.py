@@ -1,15 +1,23 @@
+import logging
+import os
 from enum import Enum
 from lib2to3.pytree import Base
-from typing import List, Set, Dict, Optional, Union
+from typing import Any, Callable, Tuple, List, FrozenSet, Dict, Optional, Union
 from datetime import datetime, time, timedelta
+from functools import lru_cache
 from uuid import UUID
 from click import option
 
-from fastapi import FastAPI, Query, Path, Body, Request, HTTPException, status
+import orjson
+
+from fastapi import APIRouter, FastAPI, Query, Path, Body, Request, HTTPException, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import PlainTextResponse, ORJSONResponse, Response
+from fastapi.routing import APIRoute
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.routing import Match, Route
+from starlette.types import Receive, Scope, Send
 from pydantic import BaseModel, Field, HttpUrl
 
 
@@ -31,16 +39,19 @@ class Image(BaseModel):
 
 # Data Model을 정의한다. 정의할 때는 이전에 Query Parameters에서와 비슷하게 정의가능
 # 기본값 지정 : 필수 데이터, Type Hinting 적극 활용, Optional을 통한 조건부 데이터 지정 가능 등등
-## List 및 Set 모듈을 사용하여 Model에 여러 데이터 타입을 사용하는 예제
-# 당연히 Dict도 사용 가능하다.
+## Tuple 및 FrozenSet 모듈을 사용하여 Model에 여러 데이터 타입을 사용하는 예제
+# 목록 데이터에는 List[str], 중복 없는 데이터에는 Set[str]도 같은 방법으로 사용할 수 있다. 당연히 Dict도 사용 가능하다.
+#   - tagL은 List, tagS는 Set 타입으로 작성했던 필드로, 읽기 전용으로만 사용하므로 immutable 타입인 Tuple, FrozenSet으로 변경하였다.
+#   - Tuple[str, ...]는 길이 제한 없이 str로만 구성된 tuple을 의미하며, 입력과 출력은 List, Set과 마찬가지로 JSON Array이다.
 class Item(BaseModel):
     name: str
     description: Optional[str] = None
     price: float
     # tax: Optional[float] = None
     tax: float = 10.5
-    tagL: List[str] = []
-    tagS: Set[str] = set()
+    # 기본값이 mutable한 []나 set()이면 인스턴스마다 복사본이 만들어지므로, 복사가 필요 없는 빈 tuple과 frozenset을 공유하도록 지정
+    tagL: Tuple[str, ...] = ()
+    tagS: FrozenSet[str] = frozenset()
     image: Optional[Image] = None
     
     ## 사용자 정의 Data Model에 대하여 데이터 값 예시를 지정하는 방법의 예제
@@ -124,12 +135,219 @@ class UnicornException(Exception):
         self.name = name
 
 
-app = FastAPI()
-
-
+## Request Body의 JSON 파싱을 표준 json 대신 orjson으로 처리하는 예제
+# FastAPI는 Body를 Pydantic Model로 검사하기 전에 request.json()으로 파싱하므로, Request와 APIRoute를 확장하여 교체한다.
+#   - orjson은 UTF-8만 지원하므로, BOM이 붙었거나 UTF-16/32로 인코딩된 Body와 잘못된 JSON은 기존 request.json()으로 다시 파싱한다.
+#     (잘못된 JSON에 대한 422 응답과 오류 내용도 기존과 동일하게 유지된다.)
+#   - Body를 받지 않는 API는 Request를 교체할 필요가 없으므로 기존 handler를 그대로 사용한다.
+class ORJSONRequest(Request):
+    async def json(self) -> Any:
+        if not hasattr(self, '_json'):
+            try:
+                self._json = orjson.loads(await self.body())
+            except orjson.JSONDecodeError:
+                return await super().json()
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+        if self.body_field is None:
+            return original_route_handler
+
+        async def custom_route_handler(request: Request) -> Response:
+            request = ORJSONRequest(request.scope, request.receive)
+            return await original_route_handler(request)
+
+        return custom_route_handler
+
+
+## Path의 첫번째 구간(segment)을 기준으로 비교할 Route 후보를 미리 나눠두는 Router 예제
+# Starlette의 Router는 요청마다 등록된 모든 Route의 정규표현식을 순서대로 비교한다.
+# 첫번째 구간이 고정된 Route는 해당 구간의 후보 목록에만, 첫번째 구간부터 Path Parameter인 Route는 모든 후보 목록에 넣는다.
+#   - 각 후보 목록은 등록 순서를 유지하므로 먼저 등록된 API가 우선하는 동작은 그대로이다.
+#   - 일치하는 Route가 없으면 기본 Router의 동작(redirect_slashes, 404)으로 넘긴다.
+#   - 후보 목록은 모든 API가 등록된 이후인 startup 이벤트에서 한 번 구성한다. startup 없이 요청이 들어오면 첫 요청에서 구성한다.
+#   - 구성한 이후에 Route를 추가, 삭제, 교체했다면 build_prefix_routes()를 다시 호출해야 한다.
+# 후보 목록을 찾기 전에 다음 두 단계를 먼저 확인한다.
+#   - 고정 URI : Path 전체를 Key로 하는 Dict에 해당 Path와 일치하는 Route만 미리 모아두고 그대로 사용
+#   - 최근 요청 : (Method, Path)의 hash 값으로 256칸 중 한 칸을 골라, 마지막으로 일치했던 Route를 기록해두고 재사용
+# 후보 목록이 '/files/{file_path:path}'처럼 첫번째 구간 뒤 전체를 받는 Route 하나뿐이라면, 정규표현식 대신 Path의 나머지를 잘라서 그대로 넘긴다.
+#   - 정규표현식의 '.'과 동일하게 줄바꿈 문자가 포함된 Path나 Method가 다른 요청은 기존 방식으로 처리한다.
+class PrefixRouter(APIRouter):
+    prefix_routes_built = False
+
+    def build_prefix_routes(self) -> None:
+        self.prefix_routes = {}
+        self.shared_routes = []
+        for route in self.routes:
+            segment = route.path.split('/')[1] if isinstance(route, Route) else '{'
+            if '{' in segment:
+                self.shared_routes.append(route)
+                for routes in self.prefix_routes.values():
+                    routes.append(route)
+            else:
+                self.prefix_routes.setdefault(segment, list(self.shared_routes)).append(route)
+
+        self.static_routes = {}
+        for route in self.routes:
+            if isinstance(route, Route) and '{' not in route.path and route.path not in self.static_routes:
+                self.static_routes[route.path] = [
+                    candidate for candidate in self.prefix_routes[route.path.split('/')[1]]
+                    if not isinstance(candidate, Route) or candidate.path_regex.match(route.path)
+                ]
+
+        self.wildcard_routes = {}
+        for segment, routes in self.prefix_routes.items():
+            route = routes[0]
+            prefix = '/' + segment + '/'
+            if (
+                len(routes) == 1
+                and isinstance(route, APIRoute)
+                and route.path.startswith(prefix + '{')
+                and route.path.endswith(':path}')
+                and route.path.count('{') == 1
+            ):
+                param_name = route.path[len(prefix) + 1 : -len(':path}')]
+                self.wildcard_routes[segment] = (route, param_name, len(prefix))
+
+        self.hot_routes = [None] * 256
+        self.prefix_routes_built = True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # 'OPTIONS *' 요청의 '*'이나 빈 Path처럼 '/'로 시작하지 않는 Path는 기본 Router의 동작으로 처리한다.
+        if scope['type'] != 'http' or not scope['path'].startswith('/'):
+            await super().__call__(scope, receive, send)
+            return
+
+        if not self.prefix_routes_built:
+            self.build_prefix_routes()
+
+        if 'router' not in scope:
+            scope['router'] = self
+
+        path = scope['path']
+        hot_key = (scope['method'], path)
+        hot_slot = hash(hot_key) & 255
+        hot_route = self.hot_routes[hot_slot]
+        if hot_route is not None and hot_route[0] == hot_key:
+            routes = hot_route[1:]
+        else:
+            routes = self.static_routes.get(path)
+            if routes is None:
+                segment = path.split('/', 2)[1]
+                wildcard_route = self.wildcard_routes.get(segment)
+                if wildcard_route is not None:
+                    route, param_name, prefix_size = wildcard_route
+                    param_value = path[prefix_size:]
+                    if scope['method'] in route.methods and len(path) >= prefix_size and '\n' not in param_value:
+                        path_params = dict(scope.get('path_params', {}))
+                        path_params[param_name] = param_value
+                        scope.update({'endpoint' : route.endpoint, 'path_params' : path_params, 'route' : route})
+                        await route.handle(scope, receive, send)
+                        return
+                routes = self.prefix_routes.get(segment, self.shared_routes)
+
+        partial = None
+        for route in routes:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                self.hot_routes[hot_slot] = (hot_key, route)
+                scope.update(child_scope)
+                await route.handle(scope, receive, send)
+                return
+            if match == Match.PARTIAL and partial is None:
+                partial, partial_scope = route, child_scope
+
+        if partial is not None:
+            scope.update(partial_scope)
+            await partial.handle(scope, receive, send)
+            return
+
+        await super().__call__(scope, receive, send)
+
+
+# Model 객체나 set/frozenset처럼 orjson이 직접 처리하지 못하는 값이 포함된 응답에 사용하는 ORJSONResponse 확장 예제
+# orjson은 처리하지 못하는 값을 만나면 default 함수의 반환값으로 대신 직렬화한다.
+#   - Model은 필드 값이 저장된 __dict__를, set/frozenset은 list로 변환하여 jsonable_encoder와 동일한 결과가 나오도록 구성
+def orjson_default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError
+
+
+class ModelORJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=orjson_default)
+
+
+# default_response_class를 ORJSONResponse로 지정하면 dict를 반환하는 API들도 표준 json 대신 orjson으로 직렬화된다.
+# 다만 dict를 반환하면 jsonable_encoder를 먼저 거치므로, 기본 타입만 담긴 응답은 ORJSONResponse를 직접 반환하여 이 과정을 생략한다.
+app = FastAPI(default_response_class=ORJSONResponse)
+# FastAPI는 Router 클래스를 지정하는 옵션이 없으므로, 생성된 Router 객체의 클래스를 PrefixRouter로 교체한다.
+#   - 이미 생성된 객체의 클래스만 바꾸는 방식이므로 PrefixRouter는 __init__에서 상태를 추가하거나 __slots__를 정의하면 안 된다.
+#     (필요한 상태는 클래스 속성의 기본값과 build_prefix_routes()에서 만든다.)
+app.router.__class__ = PrefixRouter
+app.router.route_class = ORJSONRoute
+app.add_event_handler('startup', app.router.build_prefix_routes)
+
+# 요청마다 출력되는 uvicorn의 Access Log를 끈다. uvicorn 실행 옵션의 --no-access-log와 같은 효과
+logging.getLogger('uvicorn.access').disabled = True
+
+
+## OpenAPI 문서를 한 번만 직렬화해서 재사용하는 예제
+# 기본으로 등록되는 /openapi.json은 app.openapi()로 캐시된 Dict를 요청마다 다시 JSON으로 직렬화한다.
+# 모든 API가 등록된 이후인 첫 요청 시점에 bytes로 만들어두고, 이후에는 그대로 반환하도록 기본 Route를 교체
+#   - 기본 Route처럼 root_path(프록시 경로)가 servers에 없으면 추가하며, 이때는 캐시된 문서를 버리고 다시 만든다.
+openapi_payload = None
+openapi_server_urls = {server.get('url') for server in app.servers if server.get('url')}
+
+async def openapi_json(request: Request) -> Response:
+    global openapi_payload
+    root_path = request.scope.get('root_path', '').rstrip('/')
+    if root_path not in openapi_server_urls:
+        if root_path and app.root_path_in_servers:
+            app.servers.insert(0, {'url': root_path})
+            openapi_server_urls.add(root_path)
+            app.openapi_schema = None
+            openapi_payload = None
+    if openapi_payload is None:
+        openapi_payload = orjson.dumps(app.openapi())
+    return Response(openapi_payload, media_type='application/json')
+
+for index, route in enumerate(app.router.routes):
+    if isinstance(route, Route) and route.path == app.openapi_url:
+        app.router.routes[index] = Route(app.openapi_url, openapi_json, include_in_schema=False)
+
+
+# 내용이 변하지 않는 응답은 import 시점에 미리 JSON bytes로 직렬화한 Response 객체로 만들어두고 그대로 반환한다.
+#   - 요청마다 dict를 만들고 jsonable_encoder, JSON 직렬화를 거치는 과정을 생략할 수 있다.
+root_response = Response(orjson.dumps({'Message' : 'Basic example of FastAPI'}), media_type='application/json')
+
+# 문서(OpenAPI) 표시용 API. 실제 <~/> 요청은 파일 아래쪽의 constant_routes가 먼저 일치하여 처리한다.
+#   - 응답을 바꾸려면 이 함수가 아니라 root_response를 수정해야 한다.
 @app.get('/')
 async def root():
-    return {'Message' : 'Basic example of FastAPI'}
+    return root_response
+
+
+## 고정된 URI를 별도의 APIRouter에 모아서 등록하는 예제
+# Path Parameter가 없는 <~/users/me>를 별도의 Router에 정의한 뒤 include_router로 등록한다.
+#   - include_router는 호출한 시점에 Route를 추가하므로, 파일 아래쪽의 <~/users/{user_id}>보다 먼저 등록된다.
+#   - 다만 실제 <~/users/me> 요청은 파일 아래쪽의 constant_routes가 먼저 일치하여 처리하므로, read_user_me는 문서(OpenAPI) 표시용이다.
+#   - 응답을 바꾸려면 이 함수가 아니라 user_me_response를 수정해야 한다.
+static_router = APIRouter(route_class=ORJSONRoute)
+
+user_me_response = Response(orjson.dumps({'user_id' : 'Me!'}), media_type='application/json')
+
+@static_router.get('/users/me')
+async def read_user_me():
+    return user_me_response
+
+app.include_router(static_router)
 
 
 union_test_items = {
@@ -168,9 +386,10 @@ async def item_read_with_except_handling(item_id: str):
 
 
 # Custom Exception을 사용하는 예제
+# Exception Handler의 응답도 다른 API와 마찬가지로 orjson으로 직렬화되도록 ORJSONResponse를 사용
 @app.exception_handler(UnicornException)
 async def unicorn_exception_handler(request: Request, exc: UnicornException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=418,
         content={"message" : "Oops! {} did something wrong!".format(exc.name)}
     )
@@ -198,9 +417,10 @@ async def read_item_override_exception(item_id: int):
     
 
 # Validation Error 발생하였을 때, Request Body에 입력되었던 데이터를 Response에 포함시키는 예제
+#   - 에러 내용에는 JSON 기본 타입이 아닌 값이 포함될 수 있으므로 jsonable_encoder로 변환한 뒤 orjson으로 직렬화한다.
 @app.exception_handler(RequestValidationError)
 async def validtation_exception_handler(request: Request, exc: RequestValidationError):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content=jsonable_encoder({"detail" : exc.errors(), "body" : exc.body}),
     )
@@ -395,8 +615,8 @@ async def read_items_path(
 ):
     results = {'item_id' : item_id}
     if q:
-        results.update({'q' : q})    
-    return results
+        results['q'] = q
+    return ORJSONResponse(results)
 
 
 ## Query parameters에 다양한 유효섬검사를 추가하는 예제
@@ -408,7 +628,7 @@ async def read_items_with_valid(q: Optional[str] = Query(None, min_length=3, max
     results = [{'item_id' : 'Item01'}, {'item_id' : 'Item02'}]
     if q:
         results.update({'q' : q})
-    return results
+    return ORJSONResponse(results)
 
 
 # List/Multiple values to Path Parameters 예제
@@ -418,7 +638,7 @@ async def read_items_with_valid(q: Optional[str] = Query(None, min_length=3, max
 @app.get('/items_with_multiple_vals')
 async def read_items_with_multiple_val(q: Optional[List[str]] = Query(None)):
     query_items = {'q' : q}
-    return query_items
+    return ORJSONResponse(query_items)
 
 
 # Metadata 정의 예제
@@ -435,8 +655,8 @@ async def read_items_metadata(
     ):
         results = {'items' : [{'item_id' : 'Foo'}, {'item_id' : 'Bar'}]}
         if q:
-            results.update({'q' : q})
-        return results
+            results['q'] = q
+        return ORJSONResponse(results)
     
     
 ## POST Method API의 예제
@@ -444,13 +664,14 @@ async def read_items_metadata(
 # 이후 지정한 변수로 입력된 데이터를 활용 가능함(예제에서는 <item> 변수)
 # DRF와 같이 유효성 검사 전/후 데이터가 나뉘지는 않고 입력 유효성 검사를 통과한 이후 객체에 대해서도 데이터 수정이 가능
 #   - DRF는 데이터 직접 접근을 막는 편 (확실하게 확인할 필요는 있음)
+# item.dict()는 Nested Model까지 모든 필드를 다시 순회하므로, 필드 값이 저장된 __dict__를 복사해서 사용
+#   - Nested Model(Image)은 Model 객체 그대로 남지만 ModelORJSONResponse의 직렬화 단계에서 동일하게 변환된다.
 @app.post('/items/')
 async def create_item(item: Item):
-    item_dict = item.dict()
+    item_dict = item.__dict__.copy()
     if item.tax:
-        price_with_tax = item.price + item.tax
-        item_dict.update({'price with tax' : price_with_tax})
-    return item_dict
+        item_dict['price with tax'] = item.price + item.tax
+    return ModelORJSONResponse(item_dict)
 
 
 # PUT Method를 사용한 Path parameters와 Query parameters, Request Body를 함께 활용하는 예제
@@ -458,23 +679,48 @@ async def create_item(item: Item):
 #   - API URI에 포함된 경우, Path parameters로 구분한다.
 #   - int/float/str/bool과 같은 Singular 타입의 경우, Qeury parameter로 구분한다.
 #   - Pydantic Model로 정의 되었을 경우, Request의 Body 데이터로 구분한다.
+# item.dict()로 임시 Dict를 만든 뒤 다시 펼쳐서 복사하지 않고, __dict__의 필드 값을 한 번에 옮겨 담는다.
 @app.put('/items/{item_id}')
 async def create_item(item_id: int, item: Item, q: Optional[str] = None):
-    result = {"item_id" : item_id, **item.dict()}
+    result = {"item_id" : item_id}
+    result.update(item.__dict__)
     if q:
-        result.update({'q' : q})
-    return result
+        result['q'] = q
+    return ModelORJSONResponse(result)
 
 
 fake_item_db = [{'item_name' : 'Item_01'}, {'item_name' : 'Item_02'}, {'item_name' : 'Item_03'}]
 
+# fake_item_db 전체를 하나의 JSON bytes로 미리 직렬화하고, 각 Item이 시작하는 위치(offset)를 함께 기록해둔다.
+# fake_item_offsets[i]는 i번째 Item의 시작 위치이며, 마지막 값은 닫는 괄호(])의 다음 위치이다.
+fake_item_chunks = [orjson.dumps(fake_item) for fake_item in fake_item_db]
+fake_item_payload = b'[' + b','.join(fake_item_chunks) + b']'
+fake_item_view = memoryview(fake_item_payload)
+fake_item_offsets = [1]
+for fake_item_chunk in fake_item_chunks:
+    fake_item_offsets.append(fake_item_offsets[-1] + len(fake_item_chunk) + 1)
+
 
 ## Query Parameters를 적용하는 예제. Query String과 동일한 형태 및 활용 방식을 보이고 있다.
 # Query Parameters의 값은 기본적으로는 문자열 데이터이나 Type Hinting을 적용하여 변환 가능함
 # Type Hinting의 형태에 더해서 기본 값을 지정해줄 수 있다.
+# fake_item_db는 변하지 않는 데이터이므로 미리 직렬화해둔 bytes에서 해당 범위만 잘라서 응답을 구성하고,
+# (skip, limit) 조합별 결과는 lru_cache로 캐시해서 재사용
+#   - range를 slicing하면 음수 skip 등도 List slicing과 동일한 범위로 정리된다.
+#   - 전체 범위라면 직렬화된 bytes를 그대로 반환하고, 일부 범위는 memoryview로 복사 없이 잘라낸 뒤 한 번에 이어 붙인다.
+#   - fake_item_db가 변경되는 경우에는 직렬화 데이터를 다시 만들고 read_item_page.cache_clear()로 캐시를 비워야 한다.
+@lru_cache(maxsize=256)
+def read_item_page(skip: int, limit: int) -> bytes:
+    page = range(len(fake_item_db))[skip : skip + limit]
+    if not page:
+        return b'[]'
+    if len(page) == len(fake_item_db):
+        return fake_item_payload
+    return b''.join((b'[', fake_item_view[fake_item_offsets[page.start] : fake_item_offsets[page.stop] - 1], b']'))
+
 @app.get('/items/')
 async def read_item(skip: int = 0, limit: int = 10):
-    return fake_item_db[skip : skip + limit]
+    return Response(read_item_page(skip, limit), media_type='application/json')
 
 
 # Optional Parameters를 적용하는 예제. Python 3.10 이상에서는 문법이 변경되는 점 참고해야 함
@@ -486,12 +732,10 @@ async def read_item(skip: int = 0, limit: int = 10):
 async def read_item_opt(item_id: str, q: Optional[str] = None, short: bool = False):
     item = {'item_id' : item_id}
     if q:
-        item.update({'q' : q})
+        item['q'] = q
     if not short:
-        item.update(
-            {'Description' : 'This is an amazing item that has a long description'}
-        )
-    return item
+        item['Description'] = 'This is an amazing item that has a long description'
+    return ORJSONResponse(item)
 
 
 # Required Query Parameters 예제. 필수적인 Parameters에 대해 정의하는 예제
@@ -502,7 +746,7 @@ async def read_item_opt(item_id: str, q: Optional[str] = None, short: bool = Fal
 @app.get('/read_user_item/{item_id}')
 async def read_user_item(item_id: str, needy: str, skip: int = 0, limit: Optional[int] = None):
     item = {'item_id' : item_id, 'needy' : needy, 'skip' : skip, 'limit' : limit}
-    return item
+    return ORJSONResponse(item)
 
 
 ## 간단한 Path Parameters 예제
@@ -516,27 +760,78 @@ async def read_user_item(item_id: str, needy: str, skip: int = 0, limit: Optiona
 # 정의된 API 코드에는 순서가 적용된다. 아래와 같은 예시로 구성한 후 <~/users/me> 로 API를 Call하면 확인할 수 있는
 # 결과는 {'user_id' : 'Me!'} 뿐이다.
 # 따라서 고정된 URI를 구성할 때에는 잘 "생각"하고 구성해야 한다.
-@app.get('/users/me')
-async def read_user_me():
-    return {'user_id' : 'Me!'}
+#   - <~/users/me>는 파일 아래쪽의 constant_routes가 가장 앞에 등록되어 처리한다.
+#   - 문서에 표시되는 read_user_me는 파일 상단의 static_router에 정의하여 아래 API보다 먼저 등록되도록 구성하였다.
 @app.get('/users/{user_id}')
 async def read_user(user_id: str):
-    return {'user_id' : user_id}
+    return ORJSONResponse({'user_id' : user_id})
 
 
 # Enum 객체를 통해서 사전에 정의된 값을 Path Parameters에 활용할 수 있다.
+# Enum 멤버는 Dict의 Key로도 사용할 수 있으므로, 멤버별 응답을 미리 직렬화해두고 조회만 하도록 구성
+#   - Enum 멤버에 해당하는 URI는 아래의 constant_routes가 먼저 처리하므로, get_model은 문서(OpenAPI) 표시와
+#     Enum 멤버가 아닌 값에 대한 유효성 검사 에러 응답만 담당한다. 응답을 바꾸려면 model_messages를 수정해야 한다.
+model_messages = {
+    ModelEnum.alexnet : 'Deep Learning FTW!',
+    ModelEnum.lenet : 'LeCNN all the images',
+    ModelEnum.resnet : 'Have some residuals',
+}
+model_responses = {
+    model : Response(orjson.dumps({'model_name' : model.value, 'Message' : message}), media_type='application/json')
+    for model, message in model_messages.items()
+}
+
 @app.get('/models/{model_name}')
 async def get_model(model_name: ModelEnum):
-    if model_name == ModelEnum.alexnet:
-        return {'model_name' : model_name, 'Message' : 'Deep Learning FTW!'}
-
-    if model_name.value == 'lenet':
-        return {'model_name' : model_name, 'Message' : 'LeCNN all the images'}
-    
-    return {'model_name' : model_name, 'Message' : 'Have some residuals'}
+    return model_responses[model_name]
+
+
+## FastAPI의 Parameter 분석 과정을 거치지 않는 Starlette Route 예제
+# 고정된 응답만 반환하는 API는 Starlette의 Route로도 등록하여, 요청마다 수행되는 의존성 분석 및 유효성 검사 과정을 생략한다.
+#   - Starlette Route를 Router의 가장 앞(/openapi.json, static_router 등 모든 Route보다 앞)에 추가하므로 이 Route들이 실제 응답을 담당한다.
+#   - 위에서 FastAPI로 등록한 root, read_user_me, get_model은 문서(OpenAPI)에 표시하기 위해서만 남겨두었다.
+#   - /models/{model_name}은 Enum 멤버별 고정 URI로 등록하므로, 그 외의 값은 기존 API로 넘어가서 유효성 검사 에러를 응답한다.
+#   - Starlette Route는 GET을 지정하면 HEAD도 자동으로 허용하므로, 이 URI들은 HEAD 요청에도 405 대신 200으로 응답한다.
+def constant_endpoint(response: Response) -> Callable:
+    async def endpoint(request: Request) -> Response:
+        return response
+    return endpoint
+
+constant_routes = [
+    Route('/', constant_endpoint(root_response)),
+    Route('/users/me', constant_endpoint(user_me_response)),
+]
+constant_routes += [
+    Route('/models/' + model.value, constant_endpoint(response))
+    for model, response in model_responses.items()
+]
+app.router.routes[0:0] = constant_routes
 
 
 # Path Parameters에 Path 자체가 포함될 경우 다음의 예제와 같은 :path 키워드 지정을 통해서 Path의 형태를 그대로 활용할 수 있다.
+# 응답의 형태가 {'file_path' : <str>}로 고정되어 있으므로 Dict를 만들지 않고 JSON bytes를 직접 조합한다.
+#   - 따옴표, 역슬래시, 제어 문자 등의 escape 처리는 문자열 값만 orjson으로 직렬화하여 맡긴다.
 @app.get('/files/{file_path:path}')
 async def read_file(file_path: str):
-    return {'file_path' : file_path}
\ No newline at end of file
+    return Response(b'{"file_path":' + orjson.dumps(file_path) + b'}', media_type='application/json')
+
+
+# 직접 실행할 경우 uvloop 이벤트 루프와 httptools HTTP 파서가 설치되어 있으면 이를 사용하도록 지정하여 실행
+#   - loop, http를 'auto'로 지정하면 uvloop, httptools가 있을 때 사용하고 없으면 asyncio, h11로 대체한다.
+#   - uvloop은 uvicorn[standard]가 Windows를 제외한 환경에서만 함께 설치한다.
+#   - uvicorn main:app --loop auto --http auto --workers $(nproc) --backlog 4096 --limit-concurrency 2048 --no-access-log 과 동일
+#   - workers를 지정하려면 app 객체 대신 "main:app"과 같은 import 문자열을 넘겨야 한다.
+#   - 요청마다 출력되는 Access Log도 끄도록 지정
+#   - gunicorn을 사용하는 경우에는 gunicorn main:app -k uvicorn.workers.UvicornWorker -w $(nproc) 의 형태로 실행
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run(
+        'main:app',
+        loop='auto',
+        http='auto',
+        workers=os.cpu_count(),
+        backlog=4096,
+        limit_concurrency=2048,
+        access_log=False,
+    )
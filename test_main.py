@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from fastapi import APIRouter
+
+from main import PrefixRouter, app
+
+
+def call_app(method: str, path: str, body: bytes = b''):
+    scope = {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'server': ('testserver', 80),
+        'client': ('testclient', 50000),
+        'root_path': '',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'headers': [(b'host', b'testserver'), (b'content-type', b'application/json')],
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(app(scope, receive, send))
+    except Exception as exc:
+        return repr(exc)
+    finally:
+        loop.close()
+    start = messages[0]
+    return start['status'], start['headers'], b''.join(message.get('body', b'') for message in messages[1:])
+
+
+def call_stock_router(method: str, path: str, body: bytes = b''):
+    app.router.__class__ = APIRouter
+    try:
+        return call_app(method, path, body)
+    finally:
+        app.router.__class__ = PrefixRouter
+
+
+## PrefixRouter가 기본 Router와 같은 응답을 반환하는지 비교
+@pytest.mark.parametrize('method, path, body', [
+    ('OPTIONS', '*', b''),
+    ('GET', '', b''),
+    ('HEAD', '', b''),
+    ('GET', '/', b''),
+    ('HEAD', '/', b''),
+    ('GET', '/users/me', b''),
+    ('GET', '/users/me/', b''),
+    ('GET', '/items', b''),
+    ('GET', '/users/bob', b''),
+    ('POST', '/users/bob', b''),
+    ('DELETE', '/items/foo', b''),
+    ('POST', '/items/', b'{"name": "a", "price": 1}'),
+    ('GET', '/models/alexnet', b''),
+    ('GET', '/files/a/b.txt', b''),
+    ('GET', '/files/', b''),
+    ('GET', '/files', b''),
+    ('POST', '/files/a.txt', b''),
+    ('GET', '/files/a\nb', b''),
+    ('GET', '/unknown', b''),
+])
+def test_prefix_router_matches_stock_router(method, path, body):
+    assert call_app(method, path, body) == call_stock_router(method, path, body)